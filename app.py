@@ -1,11 +1,211 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import re
+import functools
+import hashlib
+import heapq
 from datetime import datetime, timedelta
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple, Optional, Iterable
 import plotly.express as px
 import plotly.graph_objects as go
 from snowflake.snowpark.context import get_active_session
+from snowflake.snowpark import functions as F
+
+# Array literals come back from Snowflake as strings like '[ "AWS", "Python" ]'
+_ARRAY_DQUOTE_RE = re.compile(r'"([^"]*)"')
+_ARRAY_SQUOTE_RE = re.compile(r"'([^']*)'")
+
+# Skill arrays are selected as ARRAY_TO_STRING(col, CHAR(31)) so they only need splitting
+ARRAY_DELIMITER = '\x1f'
+
+# Freestyle array columns grouped by the skill bucket they feed
+RELEVANT_SKILL_BUCKETS = {
+    'high_proficiency': ['SELF_ASSESMENT_SKILL_300', 'SELF_ASSESMENT_SKILL_400',
+                         'MGR_SCORE_SKILL_200', 'MGR_SCORE_SKILL_300', 'MGR_SCORE_SKILL_400'],  # 300-400 level or manager endorsed
+    'medium_proficiency': ['SELF_ASSESMENT_SKILL_100', 'SELF_ASSESMENT_SKILL_200', 'MGR_SCORE_SKILL_100'],  # 100-200 level
+    'basic_proficiency': ['SELF_ASSESMENT_SKILL_0', 'SELF_ASSESMENT_SKILL_NULL',
+                          'MGR_SCORE_SKILL_0', 'MGR_SCORE_SKILL_NULL'],  # 0 level or null
+    'certifications': ['CERT_INTERNAL', 'CERT_EXTERNAL'],
+    'specialties': ['SPECIALTIES']
+}
+
+SE_SKILL_BUCKETS = {
+    'high_skills': ['SELF_ASSESMENT_SKILL_400', 'SELF_ASSESMENT_SKILL_300',
+                    'MGR_SCORE_SKILL_400', 'MGR_SCORE_SKILL_300'],  # 300-400 level
+    'medium_skills': [],
+    'specialties': ['SPECIALTIES'],
+    'certifications': ['CERT_EXTERNAL', 'CERT_INTERNAL']
+}
+
+FREESTYLE_TABLE = "SALES.SE_REPORTING.FREESTYLE_SUMMARY"
+
+FREESTYLE_COLUMNS = [
+    'EMPLOYEE_ID', 'USER_ID', 'NAME', 'EMAIL',
+    'SELF_ASSESMENT_SKILL_NULL', 'SELF_ASSESMENT_SKILL_0', 'SELF_ASSESMENT_SKILL_100',
+    'SELF_ASSESMENT_SKILL_200', 'SELF_ASSESMENT_SKILL_300', 'SELF_ASSESMENT_SKILL_400',
+    'MGR_SCORE_SKILL_NULL', 'MGR_SCORE_SKILL_0', 'MGR_SCORE_SKILL_100',
+    'MGR_SCORE_SKILL_200', 'MGR_SCORE_SKILL_300', 'MGR_SCORE_SKILL_400',
+    'CERT_INTERNAL', 'CERT_EXTERNAL', 'SPECIALTIES', 'EMPLOYERS'
+]
+
+# The expert search scores every skill bucket but never renders past employers
+EXPERT_SEARCH_COLUMNS = [col for col in FREESTYLE_COLUMNS if col != 'EMPLOYERS']
+
+SE_DIRECTORY_COLUMNS = [
+    'EMPLOYEE_ID', 'USER_ID', 'NAME', 'EMAIL', 'COLLEGE',
+    'SELF_ASSESMENT_SKILL_300', 'SELF_ASSESMENT_SKILL_400', 'MGR_SCORE_SKILL_300', 'MGR_SCORE_SKILL_400',
+    'SPECIALTIES', 'CERT_EXTERNAL', 'CERT_INTERNAL', 'EMPLOYERS'
+]
+
+# Manager-scored skills that count as an endorsement
+MGR_ENDORSEMENT_COLS = ['MGR_SCORE_SKILL_100', 'MGR_SCORE_SKILL_200', 'MGR_SCORE_SKILL_300', 'MGR_SCORE_SKILL_400']
+
+# Freestyle rows returned per search, best relevance first
+SEARCH_RESULT_LIMIT = 200
+
+# Sales Engineers rendered per SE Directory page
+SE_DIRECTORY_PAGE_SIZE = 100
+
+# Experts ranked and listed per "Show more" step on the search tab
+EXPERT_RESULTS_PAGE_SIZE = 50
+
+# Competitors offered as one-click searches on the search tab
+QUICK_SEARCH_TERMS = ["Databricks", "Palantir", "Tableau", "AWS", "Microsoft", "Oracle"]
+
+# POSIX ERE metacharacters, escaped so search terms match literally in REGEXP_LIKE
+_SQL_REGEX_META_RE = re.compile(r'([\\.\[\](){}*+?^$|])')
+
+def _terms_regex(search_terms: Iterable[str]) -> str:
+    """Build one bindable REGEXP_LIKE pattern matching any of the terms as a substring"""
+    alternation = "|".join(_SQL_REGEX_META_RE.sub(r'\\\1', term) for term in search_terms)
+    # REGEXP_LIKE matches the whole subject, so pad the alternation on both sides; callers pass
+    # the 's' flag so the padding also spans newlines inside the subject
+    return f".*({alternation}).*"
+
+def _parse_array_literal(value) -> Tuple[str, ...]:
+    """Parse one array value (list, delimited string or '[ "a", "b" ]' literal) into a tuple of strings"""
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    if not isinstance(value, str):
+        return ()
+    return _parse_array_text(value)
+
+@functools.lru_cache(maxsize=8192)
+def _parse_array_text(value: str) -> Tuple[str, ...]:
+    """Memoized string parsing; certifications and specialties repeat across many SEs"""
+    text = value.strip()
+    if not text:
+        return ()
+    # Plain strings are ARRAY_TO_STRING output (or a lone value)
+    if not (text.startswith('[') and text.endswith(']')):
+        return tuple(text.split(ARRAY_DELIMITER))
+
+    inner = text.strip('[]')
+    if '"' in inner:
+        return tuple(_ARRAY_DQUOTE_RE.findall(inner))
+    if "'" in inner:
+        return tuple(_ARRAY_SQUOTE_RE.findall(inner))
+    # Bracketed without quotes is a single entry
+    inner = inner.strip()
+    return (inner,) if inner else ()
+
+def _parse_array_col(series: pd.Series) -> pd.Series:
+    """Parse a column of array values into tuples of strings, parsing each distinct string once"""
+    parsed = series.map(lambda value: tuple(value) if isinstance(value, (list, tuple)) else ())
+    is_str = series.map(lambda value: isinstance(value, str)).astype(bool)
+    if not is_str.any():
+        return parsed
+
+    codes, uniques = pd.factorize(series[is_str])
+    parsed_uniques = [_parse_array_literal(value) for value in uniques]
+    parsed[is_str] = pd.Series([parsed_uniques[code] for code in codes],
+                               index=series.index[is_str], dtype=object)
+    return parsed
+
+def _collect_skills(df: pd.DataFrame, buckets: Dict[str, List[str]],
+                   pattern: Optional[re.Pattern] = None) -> List[Dict[str, List[str]]]:
+    """Bucket the array columns of every row, keeping entries matching `pattern` (or all non-blank ones)"""
+    skills_found = [{key: [] for key in buckets} for _ in range(len(df))]
+    col_bucket = {col: key for key, cols in buckets.items() for col in cols}
+    if df.empty or not col_bucket:
+        return skills_found
+
+    # One long (row, column, skill) frame replaces the nested per-row / per-column loops
+    parsed = pd.DataFrame({col: _parse_array_col(df[col]).to_numpy() for col in col_bucket})
+    long_df = (
+        parsed.rename_axis('row').reset_index()
+        .melt(id_vars='row', var_name='col', value_name='skill')
+        .explode('skill', ignore_index=True)
+        .dropna(subset=['skill'])
+    )
+    skills = long_df['skill'].astype(str)
+    if pattern is not None:
+        keep = skills.str.contains(pattern)
+    else:
+        keep = skills.str.strip() != ''
+    long_df = long_df[keep & (skills != '')].assign(skill=skills, bucket=lambda d: d['col'].map(col_bucket))
+
+    # Remove duplicates, keeping the order skills appear in
+    grouped = long_df.groupby(['row', 'bucket'], sort=False)['skill'].agg(lambda s: list(dict.fromkeys(s)))
+    for (row, key), found in grouped.items():
+        skills_found[row][key] = found
+
+    return skills_found
+
+SKILL_ARRAY_COLS = list(dict.fromkeys(
+    col for buckets in (RELEVANT_SKILL_BUCKETS, SE_SKILL_BUCKETS) for cols in buckets.values() for col in cols
+))
+
+@st.cache_data(ttl=300)
+def _parse_all_arrays(_df: pd.DataFrame, cache_key) -> pd.DataFrame:
+    """Return a copy of the frame with each skill array column replaced by parsed tuples"""
+    parsed = _df.copy()
+    for col in SKILL_ARRAY_COLS:
+        if col in parsed.columns:
+            parsed[col] = _parse_array_col(parsed[col])
+    return parsed
+
+def _frame_cache_key(df: pd.DataFrame) -> Tuple:
+    """Identify a result frame for st.cache_data without hashing the frame itself"""
+    # Shape, columns and EMPLOYEE_ID content identify the dataset. The digest is order-sensitive
+    # because cached per-row arrays are assigned back onto the frame by position
+    id_hashes = pd.util.hash_pandas_object(df['EMPLOYEE_ID'], index=False).to_numpy()
+    return (
+        df.shape,
+        tuple(df.columns),
+        hashlib.sha1(id_hashes.tobytes()).hexdigest()
+    )
+
+def _with_parsed_arrays(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse skill arrays once per dataset rather than on every Streamlit rerun"""
+    if df.empty:
+        return df
+    return _parse_all_arrays(df, _frame_cache_key(df))
+
+@st.cache_data(ttl=300)
+def _se_skill_counts(_df: pd.DataFrame, cache_key) -> np.ndarray:
+    """Count each SE's high skills, specialties and certifications once per directory dataset"""
+    return np.array([
+        len(skills['high_skills']) + len(skills['specialties']) + len(skills['certifications'])
+        for skills in _collect_skills(_df, SE_SKILL_BUCKETS)
+    ], dtype=int)
+
+@st.cache_data(ttl=300)
+def _lowered_names(_df: pd.DataFrame, cache_key) -> np.ndarray:
+    """Lower-case the NAME column once per directory dataset for case-insensitive name search"""
+    return _df['NAME'].str.lower().to_numpy(dtype=object)
+
+def _with_won_flag(df: pd.DataFrame) -> pd.DataFrame:
+    """Store STAGE_NAME as a categorical and add a boolean IS_WON column"""
+    if df.empty:
+        return df
+    # Evaluate 'Closed Won' once per distinct stage; NULL stages (code -1) map to the trailing False
+    stages = df['STAGE_NAME'].astype('category')
+    won_stages = stages.cat.categories.astype(str).str.upper().str.contains('CLOSED WON', regex=False)
+    df['STAGE_NAME'] = stages
+    df['IS_WON'] = np.append(np.asarray(won_stages, dtype=bool), False)[stages.cat.codes.to_numpy()]
+    return df
 
 # Set page config
 st.set_page_config(
@@ -74,153 +274,91 @@ class ExpertFinderSiS:
         # Get Snowflake session (automatically available in Streamlit in Snowflake)
         self.session = get_active_session()
         
-    @st.cache_data(ttl=300)
-    def search_freestyle_experts(_self, search_terms: List[str]) -> pd.DataFrame:
-        """Search for experts in Freestyle data based on skills and specialties"""
-        if not search_terms:
-            return pd.DataFrame()
-        
-        # Create a simpler, more reliable search approach using FLATTEN
-        search_conditions = []
-        
-        for term in search_terms:
-            term_upper = term.upper().replace("'", "''")  # Escape single quotes
-            
-            # Use FLATTEN-based search for each skill array type
-            skill_conditions = []
-            
-            # Self-assessment skill arrays
-            for skill_level in ['NULL', '0', '100', '200', '300', '400']:
-                skill_conditions.append(
-                    f"EXISTS(SELECT 1 FROM TABLE(FLATTEN(SELF_ASSESMENT_SKILL_{skill_level})) f "
-                    f"WHERE UPPER(f.VALUE::STRING) LIKE '%{term_upper}%')"
-                )
-            
-            # Manager score skill arrays  
-            for skill_level in ['NULL', '0', '100', '200', '300', '400']:
-                skill_conditions.append(
-                    f"EXISTS(SELECT 1 FROM TABLE(FLATTEN(MGR_SCORE_SKILL_{skill_level})) f "
-                    f"WHERE UPPER(f.VALUE::STRING) LIKE '%{term_upper}%')"
-                )
-            
-            # Specialties, certifications
-            skill_conditions.extend([
-                f"EXISTS(SELECT 1 FROM TABLE(FLATTEN(SPECIALTIES)) f WHERE UPPER(f.VALUE::STRING) LIKE '%{term_upper}%')",
-                f"EXISTS(SELECT 1 FROM TABLE(FLATTEN(CERT_INTERNAL)) f WHERE UPPER(f.VALUE::STRING) LIKE '%{term_upper}%')",
-                f"EXISTS(SELECT 1 FROM TABLE(FLATTEN(CERT_EXTERNAL)) f WHERE UPPER(f.VALUE::STRING) LIKE '%{term_upper}%')"
-            ])
-            
-            search_conditions.append(f"({' OR '.join(skill_conditions)})")
+    def _freestyle_search_query(self, search_terms: List[str], columns: Optional[List[str]] = None,
+                                skill_levels: Iterable[str] = (), require_certifications: bool = False,
+                                require_manager_endorsement: bool = False):
+        """Build the (lazy) Snowpark DataFrame for the Freestyle skills search
         
-        where_clause = " OR ".join(search_conditions)
-        
-        query = f"""
-        SELECT 
-            EMPLOYEE_ID,
-            USER_ID,
-            NAME,
-            EMAIL,
-            SELF_ASSESMENT_SKILL_NULL,
-            SELF_ASSESMENT_SKILL_0,
-            SELF_ASSESMENT_SKILL_100,
-            SELF_ASSESMENT_SKILL_200,
-            SELF_ASSESMENT_SKILL_300,
-            SELF_ASSESMENT_SKILL_400,
-            MGR_SCORE_SKILL_NULL,
-            MGR_SCORE_SKILL_0,
-            MGR_SCORE_SKILL_100,
-            MGR_SCORE_SKILL_200,
-            MGR_SCORE_SKILL_300,
-            MGR_SCORE_SKILL_400,
-            CERT_INTERNAL,
-            CERT_EXTERNAL,
-            SPECIALTIES,
-            EMPLOYERS
-        FROM SALES.SE_REPORTING.FREESTYLE_SUMMARY 
-        WHERE {where_clause}
-        ORDER BY NAME
+        A match must hit one of the `skill_levels` buckets (when given), a certification (when
+        required) and carry a manager score (when required); these run before the LIMIT.
         """
+        # Only project the columns the caller renders; names are interpolated, so whitelist them
+        columns = columns or FREESTYLE_COLUMNS
+        unknown = [col for col in columns if col not in FREESTYLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown Freestyle columns: {', '.join(unknown)}")
+        unknown = [key for key in skill_levels if key not in RELEVANT_SKILL_BUCKETS]
+        if unknown:
+            raise ValueError(f"Unknown skill levels: {', '.join(unknown)}")
+        # Skill arrays come back delimited rather than as JSON text, so no regex parsing is needed
+        select_list = ",\n            ".join(
+            f"ARRAY_TO_STRING({col}, CHAR(31)) AS {col}" if col in SKILL_ARRAY_COLS else col
+            for col in columns
+        )
         
-        try:
-            result = _self.session.sql(query).to_pandas()
-            return result
-        except Exception as e:
-            # Silently fallback to simpler search
-            return _self._search_freestyle_simple(search_terms)
-    
-    @st.cache_data(ttl=300)
-    def _search_freestyle_simple(_self, search_terms: List[str]) -> pd.DataFrame:
-        """Simplified search for Freestyle data when complex search fails"""
-        if not search_terms:
-            return pd.DataFrame()
-        
-        # Very simple search approach - just look for terms in array representations
-        search_conditions = []
+        # Join each skill bucket's arrays into one upper-cased, delimited string per row. Case is
+        # normalized once here, so the six tests below are plain LIKEs rather than one ILIKE
+        # fold per test, and each term is a single LIKE instead of a FLATTEN per array
+        def joined_upper(cols: List[str]) -> str:
+            parts = ", ".join(f"ARRAY_TO_STRING({col}, '|')" for col in cols)
+            return f"UPPER(ARRAY_TO_STRING(ARRAY_CONSTRUCT_COMPACT({parts}), '|'))"
         
-        for term in search_terms:
-            term_upper = term.upper().replace("'", "''")
-            # Simple string search across skill arrays converted to text
-            search_conditions.append(f"""
-                (UPPER(ARRAY_TO_STRING(SELF_ASSESMENT_SKILL_300, ',')) LIKE '%{term_upper}%' OR
-                 UPPER(ARRAY_TO_STRING(SELF_ASSESMENT_SKILL_400, ',')) LIKE '%{term_upper}%' OR
-                 UPPER(ARRAY_TO_STRING(MGR_SCORE_SKILL_300, ',')) LIKE '%{term_upper}%' OR
-                 UPPER(ARRAY_TO_STRING(MGR_SCORE_SKILL_400, ',')) LIKE '%{term_upper}%' OR
-                 UPPER(ARRAY_TO_STRING(SPECIALTIES, ',')) LIKE '%{term_upper}%' OR
-                 UPPER(ARRAY_TO_STRING(CERT_EXTERNAL, ',')) LIKE '%{term_upper}%')
-            """)
+        bucket_upper = ",\n                ".join(
+            f"{joined_upper(cols)} AS {key.upper()}_UPPER" for key, cols in RELEVANT_SKILL_BUCKETS.items()
+        )
+        all_skills_upper = ", ".join(f"{key.upper()}_UPPER" for key in RELEVANT_SKILL_BUCKETS)
         
-        where_clause = " OR ".join(search_conditions)
+        # Filters are applied in SQL so the LIMIT keeps the best rows among those that pass them
+        conditions = [f"REGEXP_LIKE(CONCAT_WS('|', {all_skills_upper}), t.PATTERN, 's')"]
+        if skill_levels:
+            conditions.append("(" + " OR ".join(
+                f"REGEXP_LIKE({key.upper()}_UPPER, t.PATTERN, 's')" for key in skill_levels
+            ) + ")")
+        if require_certifications:
+            conditions.append("REGEXP_LIKE(CERTIFICATIONS_UPPER, t.PATTERN, 's')")
+        if require_manager_endorsement:
+            conditions.append("(" + " OR ".join(f"ARRAY_SIZE({col}) > 0" for col in MGR_ENDORSEMENT_COLS) + ")")
+        where_clause = "\n            AND ".join(conditions)
         
+        # All terms are bound as a single regex parameter, so the SQL text is the same for every
+        # term set (one cached plan) and no manual quote escaping is needed
         query = f"""
+        WITH f AS (
+            SELECT 
+                *,
+                {bucket_upper}
+            FROM {FREESTYLE_TABLE}
+        ),
+        t AS (
+            SELECT ? AS PATTERN
+        )
         SELECT 
-            EMPLOYEE_ID,
-            USER_ID,
-            NAME,
-            EMAIL,
-            SELF_ASSESMENT_SKILL_NULL,
-            SELF_ASSESMENT_SKILL_0,
-            SELF_ASSESMENT_SKILL_100,
-            SELF_ASSESMENT_SKILL_200,
-            SELF_ASSESMENT_SKILL_300,
-            SELF_ASSESMENT_SKILL_400,
-            MGR_SCORE_SKILL_NULL,
-            MGR_SCORE_SKILL_0,
-            MGR_SCORE_SKILL_100,
-            MGR_SCORE_SKILL_200,
-            MGR_SCORE_SKILL_300,
-            MGR_SCORE_SKILL_400,
-            CERT_INTERNAL,
-            CERT_EXTERNAL,
-            SPECIALTIES,
-            EMPLOYERS
-        FROM SALES.SE_REPORTING.FREESTYLE_SUMMARY 
+            {select_list},
+            LEAST(
+                IFF(REGEXP_LIKE(HIGH_PROFICIENCY_UPPER, t.PATTERN, 's'), 25, 0)
+                + IFF(REGEXP_LIKE(MEDIUM_PROFICIENCY_UPPER, t.PATTERN, 's'), 12, 0)
+                + IFF(REGEXP_LIKE(BASIC_PROFICIENCY_UPPER, t.PATTERN, 's'), 3, 0),
+                40
+            )
+            + IFF(REGEXP_LIKE(CERTIFICATIONS_UPPER, t.PATTERN, 's'), 3, 0)
+            + IFF(REGEXP_LIKE(SPECIALTIES_UPPER, t.PATTERN, 's'), 2, 0) AS RELEVANCE,
+            COUNT(*) OVER () AS TOTAL_MATCHES
+        FROM f
+        CROSS JOIN t
         WHERE {where_clause}
-        ORDER BY NAME
-        LIMIT 1000
+        ORDER BY RELEVANCE DESC, NAME
+        LIMIT {SEARCH_RESULT_LIMIT}
         """
         
-        try:
-            result = _self.session.sql(query).to_pandas()
-            st.info(f"Using simplified search - found {len(result)} results")
-            return result
-        except Exception as e:
-            st.error(f"Both search methods failed: {str(e)}")
-            return pd.DataFrame()
+        # RELEVANCE mirrors the skill part of calculate_relevance_score (presence per bucket) so
+        # only the best SEARCH_RESULT_LIMIT rows leave Snowflake; TOTAL_MATCHES counts them all
+        return self.session.sql(query, params=[_terms_regex(term.upper() for term in search_terms)])
     
-    @st.cache_data(ttl=300)
-    def search_salesforce_experts(_self, search_terms: List[str]) -> pd.DataFrame:
-        """Search for experts based on Salesforce opportunity involvement with specific competitors"""
-        if not search_terms:
-            return pd.DataFrame()
-        
-        # Create search conditions for primary competitor
-        search_conditions = []
-        for term in search_terms:
-            search_conditions.append(f"UPPER(O.PRIMARY_COMPETITOR_C) LIKE UPPER('%{term}%')")
-        
-        where_clause = " OR ".join(search_conditions)
-        
-        query = f"""
+    def _salesforce_search_query(self, search_terms: List[str]):
+        """Build the (lazy) Snowpark DataFrame for the Salesforce competitor search"""
+        # Case-insensitive substring match on primary competitor; the terms are bound as one regex
+        # parameter so the query text (and its compiled plan) never changes
+        query = """
         SELECT 
             o.ID,
             o.NAME as OPPORTUNITY_NAME,
@@ -236,341 +374,191 @@ class ExpertFinderSiS:
             COUNT(*) OVER (PARTITION BY o.OWNER_ID) as owner_opportunity_count
         FROM FIVETRAN.SALESFORCE.OPPORTUNITY o
         LEFT JOIN FIVETRAN.SALESFORCE.ACCOUNT a ON o.ACCOUNT_ID = a.ID
-        WHERE {where_clause}
+        WHERE REGEXP_LIKE(O.PRIMARY_COMPETITOR_C, ?, 'is')
             AND o.CLOSE_DATE >= DATEADD(year, -3, CURRENT_DATE())
             AND (o.LEAD_SALES_ENGINEER_C IS NOT NULL OR o.OWNER_ID IS NOT NULL)
         ORDER BY o.CLOSE_DATE DESC
         """
         
-        try:
-            result = _self.session.sql(query).to_pandas()
-            return result
-        except Exception as e:
-            st.error(f"Error querying Salesforce data: {str(e)}")
-            return pd.DataFrame()
+        return self.session.sql(query, params=[_terms_regex(search_terms)])
     
-    def extract_relevant_skills(self, row: pd.Series, search_terms: List[str]) -> Dict[str, List[str]]:
-        """Extract skills that match search terms, organized by proficiency level"""
-        skills_found = {
-            'high_proficiency': [],  # 300-400 level or manager endorsed
-            'medium_proficiency': [], # 100-200 level
-            'basic_proficiency': [],  # 0 level or null
-            'certifications': [],
-            'specialties': []
-        }
+    @st.cache_data(ttl=600, show_spinner=False)
+    def search_experts(_self, search_terms: List[str], freestyle_columns: Optional[List[str]] = None,
+                       skill_levels: Tuple[str, ...] = (), require_certifications: bool = False,
+                       require_manager_endorsement: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Run the Freestyle and Salesforce searches concurrently, returning both result sets"""
+        if not search_terms:
+            return pd.DataFrame(), pd.DataFrame()
         
-        search_terms_upper = [term.upper() for term in search_terms]
+        # Submit both queries before waiting on either so their compile and execution overlap
+        jobs = []
+        def freestyle_query(terms):
+            return _self._freestyle_search_query(terms, freestyle_columns, skill_levels,
+                                                 require_certifications, require_manager_endorsement)
         
-        # Check high proficiency skills (300-400 level and manager scores)
-        for col in ['SELF_ASSESMENT_SKILL_300', 'SELF_ASSESMENT_SKILL_400', 
-                   'MGR_SCORE_SKILL_200', 'MGR_SCORE_SKILL_300', 'MGR_SCORE_SKILL_400']:
-            if pd.notna(row[col]) and row[col]:
-                # Parse array format like other fields
-                skill_data = row[col]
-                if isinstance(skill_data, str):
-                    skill_str = str(skill_data)
-                    if skill_str.startswith('[') and skill_str.endswith(']'):
-                        clean_skills = skill_str.strip('[]')
-                        if '"' in clean_skills:
-                            skill_matches = re.findall(r'"([^"]*)"', clean_skills)
-                        elif "'" in clean_skills:
-                            skill_matches = re.findall(r"'([^']*)'", clean_skills)
-                        else:
-                            skill_matches = [clean_skills.strip()] if clean_skills.strip() else []
-                    else:
-                        skill_matches = [skill_str.strip()] if skill_str.strip() else []
-                else:
-                    skill_matches = skill_data if isinstance(skill_data, list) else []
-                
-                for skill in skill_matches:
-                    if skill and any(term in str(skill).upper() for term in search_terms_upper):
-                        skills_found['high_proficiency'].append(str(skill))
+        for source, build_query in [('Freestyle', freestyle_query), ('Salesforce', _self._salesforce_search_query)]:
+            try:
+                jobs.append((source, build_query(search_terms).collect_nowait()))
+            except Exception as e:
+                st.error(f"Error querying {source} data: {str(e)}")
+                jobs.append((source, None))
         
-        # Check medium proficiency skills
-        for col in ['SELF_ASSESMENT_SKILL_100', 'SELF_ASSESMENT_SKILL_200', 'MGR_SCORE_SKILL_100']:
-            if pd.notna(row[col]) and row[col]:
-                # Parse array format like other fields
-                skill_data = row[col]
-                if isinstance(skill_data, str):
-                    skill_str = str(skill_data)
-                    if skill_str.startswith('[') and skill_str.endswith(']'):
-                        clean_skills = skill_str.strip('[]')
-                        if '"' in clean_skills:
-                            skill_matches = re.findall(r'"([^"]*)"', clean_skills)
-                        elif "'" in clean_skills:
-                            skill_matches = re.findall(r"'([^']*)'", clean_skills)
-                        else:
-                            skill_matches = [clean_skills.strip()] if clean_skills.strip() else []
-                    else:
-                        skill_matches = [skill_str.strip()] if skill_str.strip() else []
-                else:
-                    skill_matches = skill_data if isinstance(skill_data, list) else []
-                
-                for skill in skill_matches:
-                    if skill and any(term in str(skill).upper() for term in search_terms_upper):
-                        skills_found['medium_proficiency'].append(str(skill))
+        results = []
+        for source, job in jobs:
+            if job is None:
+                results.append(pd.DataFrame())
+                continue
+            try:
+                results.append(job.result("pandas"))
+            except Exception as e:
+                st.error(f"Error querying {source} data: {str(e)}")
+                results.append(pd.DataFrame())
         
-        # Check basic proficiency skills
-        for col in ['SELF_ASSESMENT_SKILL_0', 'SELF_ASSESMENT_SKILL_NULL', 'MGR_SCORE_SKILL_0', 'MGR_SCORE_SKILL_NULL']:
-            if pd.notna(row[col]) and row[col]:
-                # Parse array format like other fields
-                skill_data = row[col]
-                if isinstance(skill_data, str):
-                    skill_str = str(skill_data)
-                    if skill_str.startswith('[') and skill_str.endswith(']'):
-                        clean_skills = skill_str.strip('[]')
-                        if '"' in clean_skills:
-                            skill_matches = re.findall(r'"([^"]*)"', clean_skills)
-                        elif "'" in clean_skills:
-                            skill_matches = re.findall(r"'([^']*)'", clean_skills)
-                        else:
-                            skill_matches = [clean_skills.strip()] if clean_skills.strip() else []
-                    else:
-                        skill_matches = [skill_str.strip()] if skill_str.strip() else []
-                else:
-                    skill_matches = skill_data if isinstance(skill_data, list) else []
-                
-                for skill in skill_matches:
-                    if skill and any(term in str(skill).upper() for term in search_terms_upper):
-                        skills_found['basic_proficiency'].append(str(skill))
+        freestyle_df, salesforce_df = results
+        return freestyle_df, salesforce_df
+    
+    def extract_relevant_skills(self, df: pd.DataFrame, search_terms: List[str],
+                                levels: Iterable[str] = tuple(RELEVANT_SKILL_BUCKETS)) -> List[Dict[str, List[str]]]:
+        """Extract skills that match search terms for every row, organized by proficiency level
         
-        # Check certifications
-        for col in ['CERT_INTERNAL', 'CERT_EXTERNAL']:
-            if pd.notna(row[col]) and row[col]:
-                # Parse array format like other fields
-                cert_data = row[col]
-                if isinstance(cert_data, str):
-                    cert_str = str(cert_data)
-                    if cert_str.startswith('[') and cert_str.endswith(']'):
-                        clean_certs = cert_str.strip('[]')
-                        if '"' in clean_certs:
-                            cert_matches = re.findall(r'"([^"]*)"', clean_certs)
-                        elif "'" in clean_certs:
-                            cert_matches = re.findall(r"'([^']*)'", clean_certs)
-                        else:
-                            cert_matches = [clean_certs.strip()] if clean_certs.strip() else []
-                    else:
-                        cert_matches = [cert_str.strip()] if cert_str.strip() else []
-                else:
-                    cert_matches = cert_data if isinstance(cert_data, list) else []
-                
-                for cert in cert_matches:
-                    if cert and any(term in str(cert).upper() for term in search_terms_upper):
-                        skills_found['certifications'].append(str(cert))
+        Only the buckets named in `levels` are scanned and returned.
+        """
+        buckets = {key: cols for key, cols in RELEVANT_SKILL_BUCKETS.items() if key in levels}
+        # One compiled alternation scans each skill for every term in a single pass
+        term_re = re.compile('|'.join(re.escape(term) for term in search_terms), re.IGNORECASE)
         
-        # Check specialties
-        if pd.notna(row['SPECIALTIES']) and row['SPECIALTIES']:
-            # Parse array format like other fields
-            specialty_data = row['SPECIALTIES']
-            if isinstance(specialty_data, str):
-                specialty_str = str(specialty_data)
-                if specialty_str.startswith('[') and specialty_str.endswith(']'):
-                    clean_specialties = specialty_str.strip('[]')
-                    if '"' in clean_specialties:
-                        specialty_matches = re.findall(r'"([^"]*)"', clean_specialties)
-                    elif "'" in clean_specialties:
-                        specialty_matches = re.findall(r"'([^']*)'", clean_specialties)
-                    else:
-                        specialty_matches = [clean_specialties.strip()] if clean_specialties.strip() else []
-                else:
-                    specialty_matches = [specialty_str.strip()] if specialty_str.strip() else []
-            else:
-                specialty_matches = specialty_data if isinstance(specialty_data, list) else []
-            
-            for specialty in specialty_matches:
-                if specialty and any(term in str(specialty).upper() for term in search_terms_upper):
-                    skills_found['specialties'].append(str(specialty))
+        return _collect_skills(df, buckets, term_re)
+    
+    def calculate_relevance_scores(self, experts: List[Dict]) -> List[float]:
+        """Calculate relevance scores for expert ranking, one array pass for all experts"""
+        if not experts:
+            return []
         
-        # Remove duplicates
-        for key in skills_found:
-            skills_found[key] = list(set(skills_found[key]))
+        def bucket_sizes(key: str) -> np.ndarray:
+            return np.fromiter((len(expert['skills'][key]) for expert in experts), dtype=np.int32, count=len(experts))
         
-        return skills_found
+        # Skill proficiency score (40% weight): high, medium and basic proficiency presence
+        skill_scores = (
+            25 * (bucket_sizes('high_proficiency') > 0)
+            + 12 * (bucket_sizes('medium_proficiency') > 0)
+            + 3 * (bucket_sizes('basic_proficiency') > 0)
+        )
+        scores = np.minimum(skill_scores, 40).astype(float)  # Cap at 40%
+        
+        # Certification bonus (15% weight) and specialties bonus (10% weight)
+        scores += np.minimum(bucket_sizes('certifications') * 3, 15)
+        scores += np.minimum(bucket_sizes('specialties') * 2, 10)
+        
+        # Enhanced Salesforce opportunity scoring (35% weight), precomputed by score_opportunities
+        scores += np.fromiter((expert.get('opportunity_score', 0.0) for expert in experts), dtype=float, count=len(experts))
+        
+        return np.round(scores, 1).tolist()
     
-    def calculate_relevance_score(self, expert_data: Dict) -> float:
-        """Calculate relevance score for expert ranking"""
-        score = 0.0
+    def score_opportunities(self, salesforce_df: pd.DataFrame) -> Dict[str, float]:
+        """Score every participant's Salesforce opportunities in one batch, keyed by user ID"""
+        if salesforce_df.empty:
+            return {}
         
-        # Skill proficiency score (40% weight)
-        skill_score = 0
-        if expert_data.get('skills', {}).get('high_proficiency'):
-            skill_score += 25  # High proficiency skills
-        if expert_data.get('skills', {}).get('medium_proficiency'):
-            skill_score += 12  # Medium proficiency skills
-        if expert_data.get('skills', {}).get('basic_proficiency'):
-            skill_score += 3   # Basic proficiency skills
+        # One entry per (participant, opportunity): a deal counts for its lead SE and its owner
+        participants = pd.concat(
+            [salesforce_df['LEAD_SALES_ENGINEER_C'], salesforce_df['OWNER_ID']], ignore_index=True
+        )
+        amounts = np.tile(salesforce_df['AMOUNT'].fillna(0).to_numpy(dtype=float), 2)
+        is_won = np.tile(salesforce_df['IS_WON'].to_numpy(dtype=bool), 2)
         
-        score += min(skill_score, 40)  # Cap at 40%
+        has_participant = participants.notna().to_numpy()
+        expert_idx, expert_ids = pd.factorize(participants[has_participant])
+        amounts, is_won = amounts[has_participant], is_won[has_participant]
+        n_experts = len(expert_ids)
         
-        # Certification bonus (15% weight)
-        if expert_data.get('skills', {}).get('certifications'):
-            score += min(len(expert_data['skills']['certifications']) * 3, 15)
+        # Base points for any opportunity, extra points for wins, bonus points based on deal size
+        points = (
+            2 + 5 * is_won
+            + np.select([amounts >= 1000000, amounts >= 500000, amounts >= 100000], [8, 5, 2], 0)
+        )
+        opp_scores = np.bincount(expert_idx, weights=points, minlength=n_experts)
+        closed_won_counts = np.bincount(expert_idx, weights=is_won, minlength=n_experts)
+        total_acv = np.bincount(expert_idx, weights=np.where(amounts > 0, amounts, 0), minlength=n_experts)
         
-        # Specialties bonus (10% weight) 
-        if expert_data.get('skills', {}).get('specialties'):
-            score += min(len(expert_data['skills']['specialties']) * 2, 10)
+        # Additional bonus for multiple wins and ACV portfolio bonus ($5M+ / $2M+)
+        opp_scores += np.select([closed_won_counts >= 3, closed_won_counts >= 2], [10, 5], 0)
+        opp_scores += np.select([total_acv >= 5000000, total_acv >= 2000000], [10, 5], 0)
         
-        # Enhanced Salesforce opportunity scoring (35% weight)
-        opportunities = expert_data.get('opportunities', [])
-        if opportunities:
-            opp_score = 0
-            total_acv = 0
-            closed_won_count = 0
-            
-            for opp in opportunities:
-                # Base points for any opportunity
-                opp_score += 2
-                
-                # Bonus for Closed Won opportunities
-                if opp.get('stage', '').upper().find('CLOSED WON') != -1:
-                    closed_won_count += 1
-                    opp_score += 5  # Extra points for wins
-                
-                # ACV-based scoring
-                amount = opp.get('amount', 0)
-                if amount and amount > 0:
-                    total_acv += amount
-                    # Bonus points based on deal size
-                    if amount >= 1000000:  # $1M+
-                        opp_score += 8
-                    elif amount >= 500000:  # $500K+
-                        opp_score += 5
-                    elif amount >= 100000:  # $100K+
-                        opp_score += 2
-            
-            # Additional bonus for multiple wins
-            if closed_won_count >= 3:
-                opp_score += 10
-            elif closed_won_count >= 2:
-                opp_score += 5
-            
-            # ACV portfolio bonus
-            if total_acv >= 5000000:  # $5M+ portfolio
-                opp_score += 10
-            elif total_acv >= 2000000:  # $2M+ portfolio
-                opp_score += 5
-            
-            score += min(opp_score, 35)  # Cap at 35%
+        return dict(zip(expert_ids, np.minimum(opp_scores, 35).tolist()))  # Cap at 35%
+    
+    def aggregate_opportunities(self, salesforce_df: pd.DataFrame) -> pd.DataFrame:
+        """Group Salesforce opportunities, their count, last close date and account industries by participant user ID
         
-        return round(score, 1)
+        Returns one row per participant, indexed by user ID, ready to join onto the Freestyle experts.
+        """
+        columns = ['opportunities', 'opportunity_count', 'last_activity', 'industries']
+        if salesforce_df.empty:
+            return pd.DataFrame(columns=columns)
+        
+        # One row per (participant, opportunity); the stable sort restores query order, with the
+        # lead SE entry ahead of the owner entry for the same opportunity
+        long_df = pd.concat([
+            salesforce_df[salesforce_df[id_col].notna()].assign(
+                PARTICIPANT_ID=salesforce_df[id_col], PARTICIPANT_COUNT=salesforce_df[count_col], ROLE=role
+            )
+            for role, id_col, count_col in [
+                ('Lead Sales Engineer', 'LEAD_SALES_ENGINEER_C', 'SE_OPPORTUNITY_COUNT'),
+                ('Opportunity Owner', 'OWNER_ID', 'OWNER_OPPORTUNITY_COUNT'),
+            ]
+        ]).sort_index(kind='stable')
+        
+        # Opportunities stay typed DataFrame rows, already in the columns the results table shows
+        opp_frame = long_df[
+            ['OPPORTUNITY_NAME', 'PRIMARY_COMPETITOR_C', 'ACCOUNT_INDUSTRY', 'ROLE', 'STAGE_NAME', 'CLOSE_DATE', 'AMOUNT']
+        ].set_axis(['Opportunity', 'Competitor', 'Industry', 'Role', 'Stage', 'Close Date', 'Amount'], axis=1)
+        
+        grouped = long_df.groupby('PARTICIPANT_ID', sort=False)
+        industry = long_df['ACCOUNT_INDUSTRY']
+        industries = (
+            long_df[industry.notna() & (industry != '')]
+            .groupby('PARTICIPANT_ID')['ACCOUNT_INDUSTRY'].unique().map(frozenset)
+        )
+        
+        sf_agg = pd.DataFrame({
+            'opportunities': pd.Series(
+                {participant_id: opp_frame.take(positions) for participant_id, positions in grouped.indices.items()},
+                dtype=object
+            ),
+            'opportunity_count': grouped['PARTICIPANT_COUNT'].last(),
+            'last_activity': grouped['CLOSE_DATE'].max()
+        })
+        # Participants whose accounts have no industry get an empty set rather than NaN
+        sf_agg['industries'] = [
+            industries.get(participant_id, frozenset()) for participant_id in sf_agg.index
+        ]
+        return sf_agg[columns]
     
-    @st.cache_data(ttl=600)
+    @st.cache_data(ttl=3600)
     def get_all_sales_engineers(_self) -> pd.DataFrame:
         """Get all Sales Engineers with their college information and skills"""
-        query = """
-        SELECT 
-            EMPLOYEE_ID,
-            USER_ID,
-            NAME,
-            EMAIL,
-            COLLEGE,
-            SELF_ASSESMENT_SKILL_300,
-            SELF_ASSESMENT_SKILL_400,
-            MGR_SCORE_SKILL_300,
-            MGR_SCORE_SKILL_400,
-            SPECIALTIES,
-            CERT_EXTERNAL,
-            CERT_INTERNAL,
-            EMPLOYERS
-        FROM SALES.SE_REPORTING.FREESTYLE_SUMMARY 
-        WHERE NAME IS NOT NULL
-        ORDER BY NAME
-        """
+        # Lazy Snowpark DataFrame: filter, projection and sort compile into one query at to_pandas()
+        se_query = (
+            _self.session.table(FREESTYLE_TABLE)
+            .filter(F.col('NAME').is_not_null())
+            .select(*[
+                F.array_to_string(F.col(col), F.char(F.lit(31))).alias(col) if col in SKILL_ARRAY_COLS else F.col(col)
+                for col in SE_DIRECTORY_COLUMNS
+            ])
+            .sort(F.col('NAME'))
+        )
         
         try:
-            result = _self.session.sql(query).to_pandas()
+            result = se_query.to_pandas()
             return result
         except Exception as e:
             st.error(f"Error querying Sales Engineer data: {str(e)}")
             return pd.DataFrame()
     
-    def extract_se_skills(self, row: pd.Series) -> Dict[str, List[str]]:
-        """Extract skills for SE Directory display"""
-        skills = {
-            'high_skills': [],
-            'medium_skills': [],
-            'specialties': [],
-            'certifications': []
-        }
-        
-        # High proficiency skills (300-400 level)
-        for col in ['SELF_ASSESMENT_SKILL_400', 'SELF_ASSESMENT_SKILL_300', 'MGR_SCORE_SKILL_400', 'MGR_SCORE_SKILL_300']:
-            if pd.notna(row[col]) and row[col]:
-                # Parse array format like other fields
-                skill_data = row[col]
-                if isinstance(skill_data, str):
-                    skill_str = str(skill_data)
-                    if skill_str.startswith('[') and skill_str.endswith(']'):
-                        clean_skills = skill_str.strip('[]')
-                        if '"' in clean_skills:
-                            skill_matches = re.findall(r'"([^"]*)"', clean_skills)
-                        elif "'" in clean_skills:
-                            skill_matches = re.findall(r"'([^']*)'", clean_skills)
-                        else:
-                            skill_matches = [clean_skills.strip()] if clean_skills.strip() else []
-                    else:
-                        skill_matches = [skill_str.strip()] if skill_str.strip() else []
-                else:
-                    skill_matches = skill_data if isinstance(skill_data, list) else []
-                
-                for skill in skill_matches:
-                    if skill and str(skill).strip():
-                        skills['high_skills'].append(str(skill))
-        
-        # Specialties
-        if pd.notna(row['SPECIALTIES']) and row['SPECIALTIES']:
-            # Parse array format like other fields
-            specialty_data = row['SPECIALTIES']
-            if isinstance(specialty_data, str):
-                specialty_str = str(specialty_data)
-                if specialty_str.startswith('[') and specialty_str.endswith(']'):
-                    clean_specialties = specialty_str.strip('[]')
-                    if '"' in clean_specialties:
-                        specialty_matches = re.findall(r'"([^"]*)"', clean_specialties)
-                    elif "'" in clean_specialties:
-                        specialty_matches = re.findall(r"'([^']*)'", clean_specialties)
-                    else:
-                        specialty_matches = [clean_specialties.strip()] if clean_specialties.strip() else []
-                else:
-                    specialty_matches = [specialty_str.strip()] if specialty_str.strip() else []
-            else:
-                specialty_matches = specialty_data if isinstance(specialty_data, list) else []
-            
-            for specialty in specialty_matches:
-                if specialty and str(specialty).strip():
-                    skills['specialties'].append(str(specialty))
-        
-        # Certifications
-        for col in ['CERT_EXTERNAL', 'CERT_INTERNAL']:
-            if pd.notna(row[col]) and row[col]:
-                # Parse array format like other fields
-                cert_data = row[col]
-                if isinstance(cert_data, str):
-                    cert_str = str(cert_data)
-                    if cert_str.startswith('[') and cert_str.endswith(']'):
-                        clean_certs = cert_str.strip('[]')
-                        if '"' in clean_certs:
-                            cert_matches = re.findall(r'"([^"]*)"', clean_certs)
-                        elif "'" in clean_certs:
-                            cert_matches = re.findall(r"'([^']*)'", clean_certs)
-                        else:
-                            cert_matches = [clean_certs.strip()] if clean_certs.strip() else []
-                    else:
-                        cert_matches = [cert_str.strip()] if cert_str.strip() else []
-                else:
-                    cert_matches = cert_data if isinstance(cert_data, list) else []
-                
-                for cert in cert_matches:
-                    if cert and str(cert).strip():
-                        skills['certifications'].append(str(cert))
-        
-        # Remove duplicates
-        for key in skills:
-            skills[key] = list(set(skills[key]))
-        
-        return skills
+    def extract_se_skills(self, df: pd.DataFrame) -> List[Dict[str, List[str]]]:
+        """Extract skills for SE Directory display for every row"""
+        return _collect_skills(df, SE_SKILL_BUCKETS)
     
-    @st.cache_data(ttl=600)
+    @st.cache_data(ttl=3600)
     def get_top_industries(_self) -> List[str]:
         """Get top 50 industries from opportunities in the past 3 years"""
         query = """
@@ -596,6 +584,11 @@ class ExpertFinderSiS:
             st.error(f"Error fetching industries: {str(e)}")
             return sorted(["Financial Services", "Healthcare", "Retail", "Manufacturing", "Technology"])  # Fallback sorted
 
+@st.cache_resource
+def get_expert_finder() -> ExpertFinderSiS:
+    """Create the expert finder once per app process instead of on every rerun"""
+    return ExpertFinderSiS()
+
 @st.dialog("Sales Engineer Details")
 def show_se_modal(expert_finder, se_row):
     """Display SE details in a modal dialog"""
@@ -604,7 +597,7 @@ def show_se_modal(expert_finder, se_row):
     se_college = se_row['COLLEGE_CLEAN'] if se_row['COLLEGE_CLEAN'] else "Not specified"
     
     # Extract skills for this SE
-    skills = expert_finder.extract_se_skills(se_row)
+    skills = expert_finder.extract_se_skills(se_row.to_frame().T)[0]
     
     st.subheader(f"💼 {se_name}")
     
@@ -612,25 +605,9 @@ def show_se_modal(expert_finder, se_row):
     st.write(f"**🎓 College:** {se_college}")
     
     # Show past employers if available
-    if pd.notna(se_row['EMPLOYERS']) and se_row['EMPLOYERS']:
-        employers_str = str(se_row['EMPLOYERS'])
-        # Clean up array format similar to college
-        if employers_str.startswith('[') and employers_str.endswith(']'):
-            clean_employers = employers_str.strip('[]')
-            if '"' in clean_employers:
-                matches = re.findall(r'"([^"]*)"', clean_employers)
-                if matches:
-                    st.write(f"**🏢 Past Employers:** {', '.join(matches)}")
-            elif "'" in clean_employers:
-                matches = re.findall(r"'([^']*)'", clean_employers)
-                if matches:
-                    st.write(f"**🏢 Past Employers:** {', '.join(matches)}")
-            else:
-                clean_employers = clean_employers.strip()
-                if clean_employers:
-                    st.write(f"**🏢 Past Employers:** {clean_employers}")
-        else:
-            st.write(f"**🏢 Past Employers:** {employers_str}")
+    employers = [employer for employer in _parse_array_literal(se_row['EMPLOYERS']) if employer]
+    if employers:
+        st.write(f"**🏢 Past Employers:** {', '.join(employers)}")
     
     st.markdown("---")
     
@@ -643,40 +620,35 @@ def show_se_modal(expert_finder, se_row):
     # High proficiency skills
     if skills['high_skills']:
         st.write("**🎯 High Proficiency Skills:**")
-        skills_html = ""
-        for skill in skills['high_skills'][:10]:  # Show more in modal
-            skills_html += f'<span class="high-skill-tag">{skill}</span>'
-        st.markdown(skills_html, unsafe_allow_html=True)
+        st.markdown("".join(f'<span class="high-skill-tag">{skill}</span>' for skill in skills['high_skills'][:10]), unsafe_allow_html=True)  # Show more in modal
         st.write("")  # Add spacing
     
     # Specialties
     if skills['specialties']:
         st.write("**🚀 Specialties:**")
-        spec_html = ""
-        for spec in skills['specialties'][:8]:  # Show more in modal
-            spec_html += f'<span class="skill-tag">{spec}</span>'
-        st.markdown(spec_html, unsafe_allow_html=True)
+        st.markdown("".join(f'<span class="skill-tag">{spec}</span>' for spec in skills['specialties'][:8]), unsafe_allow_html=True)  # Show more in modal
         st.write("")  # Add spacing
     
     # Certifications
     if skills['certifications']:
         st.write("**🏅 Certifications:**")
-        cert_html = ""
-        for cert in skills['certifications'][:8]:  # Show more in modal
-            cert_html += f'<span class="cert-tag">{cert}</span>'
-        st.markdown(cert_html, unsafe_allow_html=True)
+        st.markdown("".join(f'<span class="cert-tag">{cert}</span>' for cert in skills['certifications'][:8]), unsafe_allow_html=True)  # Show more in modal
         st.write("")  # Add spacing
     
     # Email link if available
     if se_email and se_email != "No email":
         st.markdown(f"📧 **Email:** [{se_email}](mailto:{se_email})")
 
+def _set_search_input(term: str):
+    """Quick Search callback: fill the search box before the rerun reads it"""
+    st.session_state['search_input'] = term
+
 def main():
     st.markdown('<h1 class="main-header">🔍 Expert Finder</h1>', unsafe_allow_html=True)
     st.markdown("**Find internal experts for competitive opportunities using Freestyle skills and Salesforce data**")
     
-    # Initialize the expert finder
-    expert_finder = ExpertFinderSiS()
+    # Reuse one expert finder (and Snowflake session) across reruns
+    expert_finder = get_expert_finder()
     
     # Tabs for different functionalities
     tab1, tab2 = st.tabs(["🔍 Expert Search", "👥 SE Directory"])
@@ -690,30 +662,16 @@ def main():
             search_input = st.text_input(
                 "Search for expertise",
                 placeholder="e.g., Databricks, AWS, Python, Machine Learning",
-                help="Enter technologies, tools, or competitor names"
+                help="Enter technologies, tools, or competitor names",
+                key="search_input"
             )
             
-            # Quick search buttons for common competitors
+            # Quick search buttons for common competitors. They write through the text input's key
+            # in a callback, so the search survives the reruns triggered by selecting or paging results
             st.subheader("🏆 Quick Search - Common Competitors")
-            col1, col2, col3, col4, col5, col6 = st.columns(6)
-            with col1:
-                if st.button("Databricks", use_container_width=True):
-                    search_input = "Databricks"
-            with col2:
-                if st.button("Palantir", use_container_width=True):
-                    search_input = "Palantir"
-            with col3:
-                if st.button("Tableau", use_container_width=True):
-                    search_input = "Tableau"
-            with col4:
-                if st.button("AWS", use_container_width=True):
-                    search_input = "AWS"
-            with col5:
-                if st.button("Microsoft", use_container_width=True):
-                    search_input = "Microsoft"
-            with col6:
-                if st.button("Oracle", use_container_width=True):
-                    search_input = "Oracle"
+            for col, term in zip(st.columns(len(QUICK_SEARCH_TERMS)), QUICK_SEARCH_TERMS):
+                with col:
+                    st.button(term, use_container_width=True, on_click=_set_search_input, args=(term,))
             
             # Advanced filters in an expandable section
             with st.expander("🔧 Advanced Filters", expanded=False):
@@ -748,7 +706,7 @@ def main():
                 
                 # Second row for industry filter
                 st.markdown("---")
-                # Get top industries from actual data
+                # Get top industries from actual data (cached by get_top_industries for an hour)
                 top_industries = expert_finder.get_top_industries()
                 industry_filter = st.multiselect(
                     "🏢 Filter by Industry",
@@ -758,122 +716,87 @@ def main():
             
             st.markdown("---")
         # Initialize variables
+        experts_data = {}
         sorted_experts = []
         
+        # Everything that changes which experts are listed, or in what order
+        search_signature = (search_input, min_skill_level, require_certifications, require_manager_endorsement,
+                            date_range, tuple(sorted(industry_filter)))
+        
         # Main search logic
         if search_input:
-            search_terms = [term.strip() for term in search_input.split(',')]
+            # Sorted and de-duplicated so 'AWS, Python' and 'Python, AWS' share one cache entry
+            search_terms = sorted({term.strip() for term in search_input.split(',')})
+            
+            # The skill-level, certification and endorsement filters run in the Freestyle query,
+            # ahead of its row limit
+            if min_skill_level == "High (300-400)":
+                skill_levels = ('high_proficiency',)
+            elif min_skill_level == "Medium (200)":
+                skill_levels = ('high_proficiency', 'medium_proficiency')
+            else:
+                skill_levels = ()
             
             with st.spinner("Searching for experts..."):
-                # Search both data sources
-                freestyle_df = expert_finder.search_freestyle_experts(search_terms)
-                salesforce_df = expert_finder.search_salesforce_experts(search_terms)
+                # Search both data sources in a single round-trip
+                freestyle_df, salesforce_df = expert_finder.search_experts(
+                    tuple(search_terms), EXPERT_SEARCH_COLUMNS, skill_levels,
+                    require_certifications, require_manager_endorsement
+                )
+                # The query stops at SEARCH_RESULT_LIMIT rows; TOTAL_MATCHES says how many matched
+                freestyle_matches = int(freestyle_df['TOTAL_MATCHES'].iloc[0]) if not freestyle_df.empty else 0
+                freestyle_truncated = len(freestyle_df) >= SEARCH_RESULT_LIMIT
+                freestyle_df = _with_parsed_arrays(freestyle_df)
+                salesforce_df = _with_won_flag(salesforce_df)
                 
                 # Process Freestyle results
                 experts_data = {}
                 
-                for _, row in freestyle_df.iterrows():
-                    expert_id = row['EMPLOYEE_ID']
-                    if pd.notna(expert_id):
-                        skills = expert_finder.extract_relevant_skills(row, search_terms)
-                        
-                        # Apply skill level filter
-                        include_expert = True
-                        if min_skill_level == "High (300-400)" and not skills['high_proficiency']:
-                            include_expert = False
-                        elif min_skill_level == "Medium (200)" and not (skills['medium_proficiency'] or skills['high_proficiency']):
-                            include_expert = False
-                        
-                        # Apply certification filter
-                        if require_certifications and not skills['certifications']:
-                            include_expert = False
-                        
-                        # Apply manager endorsement filter
-                        if require_manager_endorsement:
-                            has_mgr_endorsement = any([
-                                row.get('MGR_SCORE_SKILL_100'), row.get('MGR_SCORE_SKILL_200'),
-                                row.get('MGR_SCORE_SKILL_300'), row.get('MGR_SCORE_SKILL_400')
-                            ])
-                            if not has_mgr_endorsement:
-                                include_expert = False
-                        
-                        # Industry filtering will be applied later using Salesforce account data
-                        
-                        if include_expert:
-                            experts_data[expert_id] = {
-                                'name': row['NAME'],
-                                'email': row['EMAIL'],
-                                'user_id': row['USER_ID'],
-                                'skills': skills,
-                                'employers': row.get('EMPLOYERS', []),
-                                'industries': set(),  # Will be populated from Salesforce account data
-                                'opportunities': [],
-                                'opportunity_count': 0,
-                                'last_activity': None
-                            }
+                # Drop rows without an expert ID before any skill extraction runs
+                if not freestyle_df.empty:
+                    freestyle_df = freestyle_df[freestyle_df['EMPLOYEE_ID'].notna()]
                 
-                # Process Salesforce results and link to experts
-                sf_expert_map = {}  # Map SF user IDs to opportunity data
+                relevant_skills = expert_finder.extract_relevant_skills(freestyle_df, search_terms)
                 
-                for _, row in salesforce_df.iterrows():
-                    # Collect industry information
-                    account_industry = row.get('ACCOUNT_INDUSTRY')
-                    
-                    # Check Lead Sales Engineer
-                    if pd.notna(row['LEAD_SALES_ENGINEER_C']):
-                        se_id = row['LEAD_SALES_ENGINEER_C']
-                        if se_id not in sf_expert_map:
-                            sf_expert_map[se_id] = {'opportunities': [], 'count': 0, 'industries': set()}
-                        
-                        # Add industry if available
-                        if pd.notna(account_industry) and account_industry:
-                            sf_expert_map[se_id]['industries'].add(account_industry)
-                        
-                        opp_info = {
-                            'name': row['OPPORTUNITY_NAME'],
-                            'competitor': row['PRIMARY_COMPETITOR_C'],
-                            'close_date': row['CLOSE_DATE'],
-                            'stage': row['STAGE_NAME'],
-                            'amount': row['AMOUNT'],
-                            'industry': row.get('ACCOUNT_INDUSTRY', 'Unknown'),
-                            'role': 'Lead Sales Engineer'
-                        }
-                        sf_expert_map[se_id]['opportunities'].append(opp_info)
-                        sf_expert_map[se_id]['count'] = row['SE_OPPORTUNITY_COUNT']
-                    
-                    # Check Opportunity Owner
-                    if pd.notna(row['OWNER_ID']):
-                        owner_id = row['OWNER_ID']
-                        if owner_id not in sf_expert_map:
-                            sf_expert_map[owner_id] = {'opportunities': [], 'count': 0, 'industries': set()}
-                        
-                        # Add industry if available
-                        if pd.notna(account_industry) and account_industry:
-                            sf_expert_map[owner_id]['industries'].add(account_industry)
-                        
-                        opp_info = {
-                            'name': row['OPPORTUNITY_NAME'],
-                            'competitor': row['PRIMARY_COMPETITOR_C'],
-                            'close_date': row['CLOSE_DATE'],
-                            'stage': row['STAGE_NAME'],
-                            'amount': row['AMOUNT'],
-                            'industry': row.get('ACCOUNT_INDUSTRY', 'Unknown'),
-                            'role': 'Opportunity Owner'
-                        }
-                        sf_expert_map[owner_id]['opportunities'].append(opp_info)
-                        sf_expert_map[owner_id]['count'] = row['OWNER_OPPORTUNITY_COUNT']
+                # Process Salesforce results: one row of opportunity data per SF user ID
+                sf_agg = expert_finder.aggregate_opportunities(salesforce_df)
+                sf_agg['opportunity_score'] = pd.Series(expert_finder.score_opportunities(salesforce_df), dtype=float)
                 
-                # Try to match Salesforce data to Freestyle experts by USER_ID or EMAIL
-                for expert_id, data in experts_data.items():
-                    user_id = data.get('user_id')
-                    if user_id in sf_expert_map:
-                        data['opportunities'] = sf_expert_map[user_id]['opportunities']
-                        data['opportunity_count'] = sf_expert_map[user_id]['count']
-                        data['industries'] = sf_expert_map[user_id]['industries']
-                        if data['opportunities']:
-                            data['last_activity'] = max(opp['close_date'] for opp in data['opportunities'])
+                # Link Salesforce data to the Freestyle experts by USER_ID. Every remaining row passed
+                # the filters; industry filtering is applied later using Salesforce account data
+                if freestyle_df.empty:
+                    freestyle_rows = []
+                else:
+                    # Several Freestyle rows may share a USER_ID, but each SF participant appears once
+                    merged = freestyle_df[['EMPLOYEE_ID', 'NAME', 'EMAIL', 'USER_ID']].merge(
+                        sf_agg, left_on='USER_ID', right_index=True, how='left', validate='many_to_one'
+                    )
+                    merged['opportunity_count'] = merged['opportunity_count'].fillna(0).astype(int)
+                    merged['opportunity_score'] = merged['opportunity_score'].fillna(0.0)
+                    freestyle_rows = zip(
+                        merged[['EMPLOYEE_ID', 'NAME', 'EMAIL', 'USER_ID', 'opportunities', 'opportunity_count',
+                                'last_activity', 'industries', 'opportunity_score']].itertuples(index=False, name=None),
+                        relevant_skills
+                    )
+                
+                for (expert_id, name, email, user_id, opportunities, opportunity_count,
+                     last_activity, industries, opportunity_score), skills in freestyle_rows:
+                    # Experts without Salesforce activity come out of the left join as NaN
+                    has_sf_data = isinstance(opportunities, pd.DataFrame)
+                    experts_data[expert_id] = {
+                        'name': name,
+                        'email': email,
+                        'user_id': user_id,
+                        'skills': skills,
+                        'industries': industries if has_sf_data else frozenset(),
+                        'opportunities': opportunities if has_sf_data else None,  # DataFrame of opportunities
+                        'opportunity_count': opportunity_count,
+                        'last_activity': last_activity if has_sf_data else None,
+                        'opportunity_score': opportunity_score
+                    }
                 
-                # Apply date range filter
+                # Date range cutoff, or None for "All time"
+                cutoff = None
                 if date_range != "All time":
                     cutoff_date = datetime.now()
                     if date_range == "Last 6 months":
@@ -882,82 +805,128 @@ def main():
                         cutoff_date -= timedelta(days=365)
                     elif date_range == "Last 2 years":
                         cutoff_date -= timedelta(days=730)
-                    
-                    filtered_experts = {}
-                    for expert_id, data in experts_data.items():
-                        if data['last_activity'] and data['last_activity'] >= cutoff_date.date():
-                            filtered_experts[expert_id] = data
-                        elif not data['last_activity']:  # Include if no opportunity data but has skills
-                            filtered_experts[expert_id] = data
-                    experts_data = filtered_experts
+                    cutoff = cutoff_date.date()
+                industry_filter_set = set(industry_filter) if industry_filter else None
                 
-                # Apply industry filter if specified
-                if industry_filter:
-                    filtered_by_industry = {}
-                    for expert_id, data in experts_data.items():
-                        expert_industries = data.get('industries', set())
-                        if expert_industries:
-                            # Check if any of the expert's industries match the filter
-                            if any(industry in industry_filter for industry in expert_industries):
-                                filtered_by_industry[expert_id] = data
-                        # If no industry data but no industry filter, keep the expert
-                    experts_data = filtered_by_industry
+                # Apply the date range and industry filters in one pass. Experts with no opportunity
+                # data still pass the date filter, but never match an industry filter
+                if cutoff is not None or industry_filter_set is not None:
+                    experts_data = {
+                        expert_id: data for expert_id, data in experts_data.items()
+                        if (cutoff is None or not data['last_activity'] or data['last_activity'] >= cutoff)
+                        and (industry_filter_set is None or data['industries'] & industry_filter_set)
+                    }
                 
                 # Calculate relevance scores and sort
-                for expert_id, data in experts_data.items():
-                    data['relevance_score'] = expert_finder.calculate_relevance_score(data)
+                relevance_scores = expert_finder.calculate_relevance_scores(list(experts_data.values()))
+                for data, relevance_score in zip(experts_data.values(), relevance_scores):
+                    data['relevance_score'] = relevance_score
                 
-                sorted_experts = sorted(
-                    experts_data.items(),
-                    key=lambda x: x[1]['relevance_score'],
-                    reverse=True
-                )
+                # Only the experts on display need ranking; "Show more" raises the count, and a new
+                # search or filter change starts over at one page
+                if st.session_state.get('experts_shown_signature') != search_signature:
+                    st.session_state['experts_shown_signature'] = search_signature
+                    st.session_state['experts_shown'] = EXPERT_RESULTS_PAGE_SIZE
+                experts_shown = st.session_state['experts_shown']
+                if len(experts_data) > experts_shown:
+                    sorted_experts = heapq.nlargest(
+                        experts_shown,
+                        experts_data.items(),
+                        key=lambda x: x[1]['relevance_score']
+                    )
+                else:
+                    sorted_experts = sorted(
+                        experts_data.items(),
+                        key=lambda x: x[1]['relevance_score'],
+                        reverse=True
+                    )
         
         # Display results
         if search_input and sorted_experts:
-            # Summary metrics
+            # Summary metrics over every matching expert, gathered in a single pass
+            total_opportunities = 0
+            total_score = 0.0
+            certified_experts = 0
+            for data in experts_data.values():
+                total_opportunities += data['opportunity_count']
+                total_score += data['relevance_score']
+                certified_experts += bool(data['skills']['certifications'])
+            
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
                 st.markdown(
-                    f'<div class="metric-card"><h3>{len(sorted_experts)}</h3><p>Experts Found</p></div>',
+                    f'<div class="metric-card"><h3>{len(experts_data)}</h3><p>Experts Found</p></div>',
                     unsafe_allow_html=True
                 )
             
             with col2:
-                total_opportunities = sum(data['opportunity_count'] for _, data in sorted_experts)
                 st.markdown(
                     f'<div class="metric-card"><h3>{total_opportunities}</h3><p>Total Opportunities</p></div>',
                     unsafe_allow_html=True
                 )
             
             with col3:
-                avg_score = sum(data['relevance_score'] for _, data in sorted_experts) / len(sorted_experts)
+                avg_score = total_score / len(experts_data)
                 st.markdown(
                     f'<div class="metric-card"><h3>{avg_score:.1f}</h3><p>Avg Relevance Score</p></div>',
                     unsafe_allow_html=True
                 )
             
             with col4:
-                certified_experts = sum(1 for _, data in sorted_experts 
-                                      if data['skills']['certifications'])
                 st.markdown(
                     f'<div class="metric-card"><h3>{certified_experts}</h3><p>Certified Experts</p></div>',
                     unsafe_allow_html=True
                 )
             
+            if freestyle_truncated:
+                st.info(
+                    f"Showing the top {SEARCH_RESULT_LIMIT} of {freestyle_matches} Freestyle matches by skill "
+                    "relevance. Refine the search terms or filters to narrow the results."
+                )
+            
             st.markdown("---")
             
-            # Expert cards
-            st.subheader(f"🏆 All Experts for '{search_input}' (sorted by relevance)")
+            # One selectable table for all experts; the detail card renders only for the selected row
+            if len(sorted_experts) < len(experts_data):
+                st.subheader(f"🏆 Top {len(sorted_experts)} of {len(experts_data)} Experts for '{search_input}' (sorted by relevance)")
+            else:
+                st.subheader(f"🏆 All Experts for '{search_input}' (sorted by relevance)")
+            st.markdown("*Click on any row to view the expert's skills and opportunities*")
+            
+            experts_table = pd.DataFrame([
+                {
+                    'Name': data['name'] if data['name'] else "Unknown Expert",
+                    'Email': data['email'] if data['email'] else "No email available",
+                    'Relevance Score': data['relevance_score'],
+                    'Opportunities': data['opportunity_count'],
+                    'Certified': bool(data['skills']['certifications'])
+                }
+                for _, data in sorted_experts
+            ])
+            event = st.dataframe(
+                experts_table,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key=f"experts_table_{hash(search_signature)}"  # New searches or filters start with no selection
+            )
+            
+            if len(sorted_experts) < len(experts_data):
+                if st.button(f"Show {min(EXPERT_RESULTS_PAGE_SIZE, len(experts_data) - len(sorted_experts))} more experts"):
+                    st.session_state['experts_shown'] = len(sorted_experts) + EXPERT_RESULTS_PAGE_SIZE
+                    st.rerun()
             
-            for expert_id, data in sorted_experts:  # Show all experts
+            if event.selection.rows and event.selection.rows[0] < len(sorted_experts):
+                expert_id, data = sorted_experts[event.selection.rows[0]]
+                
                 # Handle None values for display
                 display_name = data['name'] if data['name'] else "Unknown Expert"
                 display_email = data['email'] if data['email'] else "No email available"
                 display_user_id = data['user_id'] if data['user_id'] else "No user ID"
                 
-                with st.expander(f"⭐ {display_name} - Relevance Score: {data['relevance_score']}", expanded=False):
+                with st.expander(f"⭐ {display_name} - Relevance Score: {data['relevance_score']}", expanded=True):
                     col1, col2 = st.columns([2, 1])
                     
                     with col1:
@@ -979,31 +948,19 @@ def main():
                         
                         if skills['high_proficiency']:
                             st.write("**🎯 High Proficiency Skills:**")
-                            skills_html = ""
-                            for skill in skills['high_proficiency'][:8]:
-                                skills_html += f'<span class="high-skill-tag">{skill}</span>'
-                            st.markdown(skills_html, unsafe_allow_html=True)
+                            st.markdown("".join(f'<span class="high-skill-tag">{skill}</span>' for skill in skills['high_proficiency'][:8]), unsafe_allow_html=True)
                         
                         if skills['medium_proficiency']:
                             st.write("**📊 Medium Proficiency Skills:**")
-                            skills_html = ""
-                            for skill in skills['medium_proficiency'][:8]:
-                                skills_html += f'<span class="skill-tag">{skill}</span>'
-                            st.markdown(skills_html, unsafe_allow_html=True)
+                            st.markdown("".join(f'<span class="skill-tag">{skill}</span>' for skill in skills['medium_proficiency'][:8]), unsafe_allow_html=True)
                         
                         if skills['certifications']:
                             st.write("**🏅 Certifications:**")
-                            cert_html = ""
-                            for cert in skills['certifications'][:5]:
-                                cert_html += f'<span class="cert-tag">{cert}</span>'
-                            st.markdown(cert_html, unsafe_allow_html=True)
+                            st.markdown("".join(f'<span class="cert-tag">{cert}</span>' for cert in skills['certifications'][:5]), unsafe_allow_html=True)
                         
                         if skills['specialties']:
                             st.write("**🚀 Specialties:**")
-                            spec_html = ""
-                            for spec in skills['specialties'][:5]:
-                                spec_html += f'<span class="skill-tag">{spec}</span>'
-                            st.markdown(spec_html, unsafe_allow_html=True)
+                            st.markdown("".join(f'<span class="skill-tag">{spec}</span>' for spec in skills['specialties'][:5]), unsafe_allow_html=True)
                     
                     with col2:
                         st.metric("Relevant Opportunities", data['opportunity_count'])
@@ -1016,23 +973,16 @@ def main():
                         st.metric("Total Relevant Skills", total_skills)
                     
                     # Recent opportunities
-                    if data['opportunities']:
+                    if data['opportunities'] is not None and not data['opportunities'].empty:
                         st.write("**📊 Recent Competitive Opportunities:**")
-                        opp_data = []
-                        for opp in data['opportunities'][:5]:
-                            opp_data.append({
-                                'Opportunity': opp['name'],
-                                'Competitor': opp['competitor'],
-                                'Industry': opp.get('industry', 'Unknown'),
-                                'Role': opp['role'],
-                                'Stage': opp['stage'],
-                                'Close Date': opp['close_date'],
-                                'Amount': f"${opp['amount']:,.0f}" if opp['amount'] else "N/A"
-                            })
-                        
-                        if opp_data:
-                            opp_df = pd.DataFrame(opp_data)
-                            st.dataframe(opp_df, use_container_width=True)
+                        opp_df = data['opportunities'].head(5)
+                        st.dataframe(
+                            opp_df.assign(Amount=opp_df['Amount'].map(
+                                lambda amount: f"${amount:,.0f}" if pd.notna(amount) and amount else "N/A"
+                            )),
+                            use_container_width=True,
+                            hide_index=True
+                        )
                     
                     # Action buttons
                     # Contact information
@@ -1047,41 +997,23 @@ def main():
         st.markdown("**Browse all Sales Engineers and filter by college**")
         
         # Get all Sales Engineers data
-        se_df = expert_finder.get_all_sales_engineers()
+        se_df = _with_parsed_arrays(expert_finder.get_all_sales_engineers())
         
         if not se_df.empty:
             # Get unique colleges for filter (handle None values and array format)
             def extract_college_name(college_data):
-                if pd.isna(college_data) or not college_data:
-                    return None
-                
-                # Convert to string and clean up array/list format
-                college_str = str(college_data)
-                
-                # Handle array format like [ "Data Engineering & Lake"]
-                if college_str.startswith('[') and college_str.endswith(']'):
-                    # Remove brackets and split by comma
-                    clean_str = college_str.strip('[]')
-                    # Handle quoted strings
-                    if '"' in clean_str:
-                        # Extract text between quotes
-                        matches = re.findall(r'"([^"]*)"', clean_str)
-                        if matches:
-                            return matches[0].strip()
-                    # Handle single quotes
-                    elif "'" in clean_str:
-                        matches = re.findall(r"'([^']*)'", clean_str)
-                        if matches:
-                            return matches[0].strip()
-                    else:
-                        # Just remove brackets if no quotes
-                        return clean_str.strip()
-                
-                # If not array format, return as is
-                return college_str.strip()
+                # Handle array format like [ "Data Engineering & Lake"]; the first entry is the college
+                colleges = _parse_array_literal(college_data)
+                return colleges[0].strip() if colleges else None
             
-            # Apply college extraction and get unique values
-            se_df['COLLEGE_CLEAN'] = se_df['COLLEGE'].apply(extract_college_name)
+            # Apply college extraction once per distinct raw value (missing values, code -1, map to
+            # the trailing None) and get unique values
+            college_codes, raw_colleges = pd.factorize(se_df['COLLEGE'])
+            clean_colleges = np.array([extract_college_name(raw) for raw in raw_colleges] + [None], dtype=object)
+            se_df['COLLEGE_CLEAN'] = clean_colleges[college_codes]
+            se_cache_key = _frame_cache_key(se_df)
+            se_df['SKILL_COUNT'] = _se_skill_counts(se_df, se_cache_key)
+            se_df['NAME_LOWER'] = _lowered_names(se_df, se_cache_key)
             unique_colleges = se_df['COLLEGE_CLEAN'].dropna().unique().tolist()
             unique_colleges = [col for col in unique_colleges if col and str(col).strip()]
             unique_colleges.sort()
@@ -1105,17 +1037,17 @@ def main():
                     placeholder="Enter name to search...",
                     help="Search for specific Sales Engineers by name"
                 )
-                            # Filter the dataframe
-            filtered_df = se_df.copy()
+            # Filter the dataframe; each mask below yields a new frame, so no up-front copy
+            filtered_df = se_df
             
             # Apply college filter
             if selected_college != "All":
                 filtered_df = filtered_df[filtered_df['COLLEGE_CLEAN'] == selected_college]
             
-            # Apply name search
+            # Apply name search: a plain substring match against the pre-lowered names
             if name_search:
                 filtered_df = filtered_df[
-                    filtered_df['NAME'].str.contains(name_search, case=False, na=False)
+                    filtered_df['NAME_LOWER'].str.contains(name_search.lower(), regex=False, na=False)
                 ]
             
             # Display metrics
@@ -1128,23 +1060,32 @@ def main():
                 colleges_with_data = se_df['COLLEGE_CLEAN'].dropna().nunique()
                 st.metric("Colleges Represented", colleges_with_data)
             
+            # Only the current page goes into the table, so the rendered payload scales with the
+            # page size; skill counts are computed for the whole directory and cached per dataset
+            page_count = max(1, -(-len(filtered_df) // SE_DIRECTORY_PAGE_SIZE))
+            with filter_col3:
+                page = st.number_input(
+                    "Page",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    step=1,
+                    key=f"se_page_{selected_college}_{name_search}",  # Back to page 1 when filters change
+                    help=f"{SE_DIRECTORY_PAGE_SIZE} Sales Engineers per page"
+                )
+            page_df = filtered_df.iloc[(page - 1) * SE_DIRECTORY_PAGE_SIZE:page * SE_DIRECTORY_PAGE_SIZE]
+            
             # Prepare display dataframe
             display_data = []
-            for idx, (_, se_row) in enumerate(filtered_df.iterrows()):
-                se_name = se_row['NAME'] if se_row['NAME'] else "Unknown SE"
-                se_email = se_row['EMAIL'] if se_row['EMAIL'] else "No email"
-                se_college = se_row['COLLEGE_CLEAN'] if se_row['COLLEGE_CLEAN'] else "Not specified"
-                se_id = se_row['EMPLOYEE_ID']
-                
-                # Extract skills for skill count
-                skills = expert_finder.extract_se_skills(se_row)
-                total_skills = len(skills['high_skills']) + len(skills['specialties']) + len(skills['certifications'])
-                
+            page_rows = page_df[['NAME', 'EMAIL', 'COLLEGE_CLEAN', 'SKILL_COUNT', 'EMPLOYEE_ID']].itertuples(
+                index=False, name=None
+            )
+            for se_name, se_email, se_college, skill_count, se_id in page_rows:
                 display_data.append({
-                    'Name': se_name,
-                    'Email': se_email,
-                    'College': se_college,
-                    'Skills': total_skills,
+                    'Name': se_name if se_name else "Unknown SE",
+                    'Email': se_email if se_email else "No email",
+                    'College': se_college if se_college else "Not specified",
+                    'Skills': skill_count,  # Precomputed for the whole directory
                     'EMPLOYEE_ID': se_id  # Hidden for selection reference
                 })
             
@@ -1152,7 +1093,7 @@ def main():
             if display_data:
                 table_df = pd.DataFrame(display_data)
                 
-                st.subheader(f"👥 Sales Engineers ({len(filtered_df)} results)")
+                st.subheader(f"👥 Sales Engineers ({len(filtered_df)} results, page {page} of {page_count})")
                 st.markdown("*Click on any row to view detailed skills and expertise*")
                 
                 # Display table with selection capability
@@ -1171,7 +1112,7 @@ def main():
                     selected_se_id = display_data[selected_row_idx]['EMPLOYEE_ID']
                     
                     # Find the selected SE's data
-                    selected_se_data = filtered_df[filtered_df['EMPLOYEE_ID'] == selected_se_id]
+                    selected_se_data = page_df[page_df['EMPLOYEE_ID'] == selected_se_id]
                     if not selected_se_data.empty:
                         se_row = selected_se_data.iloc[0]
                         